@@ -12,118 +12,275 @@ must clearly explain the reason in your report.
 """
             
 
-import heapq
 import math
 
+import numpy as np
 
-class Node:
-    """A* 算法的节点类"""
+# 26 个方向的 neighbor (3x3x3 - 1)，单位为栅格
+MOVES = np.array([(dx, dy, dz)
+                  for dx in (-1, 0, 1)
+                  for dy in (-1, 0, 1)
+                  for dz in (-1, 0, 1)
+                  if (dx, dy, dz) != (0, 0, 0)])
+# 每个方向以栅格为单位的移动代价 (1, √2, √3)
+MOVE_COSTS = np.linalg.norm(MOVES, axis=1)
 
-    def __init__(self, x, y, z, g=0, h=0, parent=None):
-        self.x = x
-        self.y = y
-        self.z = z
-        self.g = g  # 起点到当前点的距离
-        self.h = h  # 当前点到终点的启发式距离
-        self.f = g + h
-        self.parent = parent
 
-    def __lt__(self, other):
-        # 优先队列通过比较 f 值来排序
-        return self.f < other.f
+def _build_expand_neighbors():
+    """
+    生成把 26 个方向完全展开的邻居扩展函数
+    每个方向的偏移量和移动代价都直接写成常量，省去循环遍历 movements 的解释器开销
+    """
+    lines = [
+        "def _expand_neighbors(key, g, is_blocked, closed_set, g_score, came_from,",
+        "                      push, other_g, tx, ty, tz, best):",
+        "    x, y, z = key",
+    ]
+    def offset(name, d):
+        return name if d == 0 else f"{name} {'+' if d > 0 else '-'} {abs(d)}"
+
+    for (dx, dy, dz), move_cost in zip(MOVES.tolist(), MOVE_COSTS.tolist()):
+        lines += [
+            f"    i, j, k = {offset('x', dx)}, {offset('y', dy)}, {offset('z', dz)}",
+            "    new_key = (i, j, k)",
+            "    if not is_blocked(new_key):",
+            f"        g_cost = g + {move_cost!r}",
+            "        if g_cost < g_score.get(new_key, inf):",
+            "            g_score[new_key] = g_cost",
+            "            came_from[new_key] = key",
+            "            closed_set.discard(new_key)",
+            "            push(g_cost + hypot(i - tx, j - ty, k - tz), new_key)",
+            "            other_cost = other_g.get(new_key)",
+            "            if other_cost is not None and g_cost + other_cost < best[0]:",
+            "                best = (g_cost + other_cost, new_key)",
+        ]
+    lines.append("    return best")
+
+    namespace = {"hypot": math.hypot, "inf": math.inf}
+    exec(compile("\n".join(lines), "<expand_neighbors>", "exec"), namespace)
+    return namespace["_expand_neighbors"]
+
+
+# 展开后的邻居扩展函数，模块加载时生成一次
+_expand_neighbors = _build_expand_neighbors()
+
+
+class BucketQueue:
+    """
+    按量化后的 f 值分桶的优先队列，push/pop 均摊 O(1)
+    同一桶内后进先出（LIFO），桶内元素之间不再按 f 或 g 排序
+    """
+
+    def __init__(self, resolution):
+        self.resolution = resolution  # 每个桶覆盖的 f 值宽度
+        self.buckets = {}  # 桶编号 -> 元素列表
+        self.min_bucket = 0  # 当前最小的非空桶编号（游标）
+        self.size = 0
+
+    def __len__(self):
+        return self.size
 
-    def get_pos(self):
-        return (self.x, self.y, self.z)
+    def push(self, f, item):
+        index = int(f / self.resolution)
+        bucket = self.buckets.get(index)
+        if bucket is None:
+            self.buckets[index] = bucket = []
+        bucket.append(item)
+        if self.size == 0 or index < self.min_bucket:
+            self.min_bucket = index
+        self.size += 1
+
+    def min_priority(self):
+        """队首元素 f 值的下界（所在桶的下沿）"""
+        if not self.size:
+            raise IndexError("min_priority from empty BucketQueue")
+        # 游标向前推进，直到遇到非空桶
+        while self.min_bucket not in self.buckets:
+            self.min_bucket += 1
+        return self.min_bucket * self.resolution
+
+    def pop(self):
+        if not self.size:
+            raise IndexError("pop from empty BucketQueue")
+        self.min_priority()
+        bucket = self.buckets[self.min_bucket]
+        item = bucket.pop()
+        if not bucket:
+            del self.buckets[self.min_bucket]
+        self.size -= 1
+        return item
 
 
 # 启发式距离计算
 def get_dist(pos1, pos2):
     """计算两点间的欧几里得距离"""
-    return math.sqrt((pos1[0] - pos2[0]) ** 2 +
-                     (pos1[1] - pos2[1]) ** 2 +
-                     (pos1[2] - pos2[2]) ** 2)
+    return math.dist(pos1, pos2)
 
 
-def a_star_search(env, start_pos=(1, 2, 0), goal_pos=(18, 18, 3), step_size=0.5):
+def make_collision_checker(env, origin, step_size, corridor=None):
+    """
+    生成带缓存的栅格检查函数：栅格 (i, j, k) 对应坐标 origin + (i, j, k) * step_size，
+    每个栅格只在第一次查询时调用环境接口，结果存入字典
+    corridor: 可选的 (points, radius)，与所有 points 的距离都不小于 radius 的栅格也视为不可通行
+    """
+    x0, y0, z0 = origin
+    if corridor is not None:
+        corridor_points = np.asarray(corridor[0], dtype=float)
+        corridor_r2 = corridor[1] ** 2
+    cache = {}
+
+    def is_blocked(key):
+        blocked = cache.get(key)
+        if blocked is None:
+            pos = (x0 + key[0] * step_size, y0 + key[1] * step_size, z0 + key[2] * step_size)
+            blocked = (corridor is not None and
+                       np.min(np.sum((corridor_points - pos) ** 2, axis=1)) >= corridor_r2)
+            blocked = blocked or env.is_outside(pos) or env.is_collide(pos)
+            cache[key] = blocked
+        return blocked
+
+    return is_blocked
+
+
+def a_star_search(env, start_pos=(1, 2, 0), goal_pos=(18, 18, 3), step_size=0.5, coarse_step=None):
     """
     参数:
     env: FlightEnvironment 对象
     start_pos: 起始坐标 tuple (x, y, z)
     goal_pos: 目标坐标 tuple (x, y, z)
     step_size: 搜索步长（精度），越小越精确但越慢
+    coarse_step: 可选的粗搜索步长（如 2.0）；先以该步长找到粗略路径，再只在其周围
+                 coarse_step 范围内以 step_size 精细搜索，速度更快但路径可能略长。
+                 默认 None，或不大于 step_size 时，直接全局精细搜索
     """
 
-    # 1. 初始化
-    start_node = Node(start_pos[0], start_pos[1], start_pos[2], g=0, h=get_dist(start_pos, goal_pos))
-    goal_node = Node(goal_pos[0], goal_pos[1], goal_pos[2])
+    path = []
+    if coarse_step is not None and coarse_step > step_size:
+        coarse_path = _search(env, start_pos, goal_pos, coarse_step)
+        if coarse_path:
+            path = _search(env, start_pos, goal_pos, step_size,
+                           corridor=(coarse_path, coarse_step))
 
-    open_list = []  # 优先队列
-    heapq.heappush(open_list, start_node)
+    # 粗搜索失败（例如通道比粗栅格还窄），或通道内找不到路径时，退回全局精细搜索
+    if not path:
+        path = _search(env, start_pos, goal_pos, step_size)
 
-    # 使用字典记录已访问节点，key为坐标字符串或元组
-    # 这里为了简单，我们用某种方式量化坐标作为key
-    closed_set = set()
+    if not path:
+        print("未找到路径！")
+    return path
 
-    # 定义移动方向：x, y, z 的变化量 (-1, 0, 1) 的所有组合
-    # 生成 26 个方向的 neighbor (3x3x3 - 1)
-    movements = []
-    for dx in [-step_size, 0, step_size]:
-        for dy in [-step_size, 0, step_size]:
-            for dz in [-step_size, 0, step_size]:
-                if dx == 0 and dy == 0 and dz == 0:
-                    continue
-                movements.append((dx, dy, dz))
 
-    while open_list:
-        # 2. 取出 f 值最小的节点
-        current_node = heapq.heappop(open_list)
+def _search(env, start_pos, goal_pos, step_size, corridor=None):
+    """以 step_size 为栅格执行一次搜索，找不到路径时返回空列表"""
 
-        # 检查是否接近目标点 (小于步长即可认为到达)
-        if get_dist(current_node.get_pos(), goal_pos) < step_size:
-            goal_node.parent = current_node
-            goal_node.g = current_node.g + get_dist(current_node.get_pos(), goal_pos)
-            return reconstruct_path(goal_node)
+    # 1. 环境查询按栅格缓存，只有搜索实际访问到的栅格才会调用环境接口
+    # 栅格以起点为原点，所有移动都是步长的整数倍，因此整数 key 与坐标一一对应
+    is_blocked = make_collision_checker(env, start_pos, step_size, corridor)
 
-        # 离散化坐标用于去重 (例如保留1位小数)
-        node_key = (round(current_node.x, 1), round(current_node.y, 1), round(current_node.z, 1))
+    # 起点即栅格 (0, 0, 0)，终点保留为以栅格为单位的浮点坐标
+    goal_ijk = tuple((g - s) / step_size for g, s in zip(goal_pos, start_pos))
 
-        if node_key in closed_set:
-            continue
-        closed_set.add(node_key)
+    keys = _astar_core(is_blocked, (0, 0, 0), goal_ijk)
+    if not keys:
+        return []
 
-        # 3. 扩展邻居节点
-        for dx, dy, dz in movements:
-            new_x = current_node.x + dx
-            new_y = current_node.y + dy
-            new_z = current_node.z + dz
-            new_pos = (new_x, new_y, new_z)
+    path = reconstruct_path(keys, start_pos, step_size)
+    path.append(list(goal_pos))
+    return path
 
-            # --- 关键：调用环境接口进行检查 ---
-            # 检查1: 是否出界
-            if env.is_outside(new_pos):
-                continue
 
-            # 检查2: 是否碰撞
-            if env.is_collide(new_pos):
-                continue
+class _SearchFront:
+    """双向 A* 中单个方向的搜索状态"""
 
-            # 4. 创建新节点并加入 Open List
-            g_cost = current_node.g + math.sqrt(dx ** 2 + dy ** 2 + dz ** 2)
-            h_cost = get_dist(new_pos, goal_pos)
+    def __init__(self, sources, target):
+        """
+        sources: 出发栅格及其初始 g 值的字典 {key: g}
+        target: 启发式指向的目标点（以栅格为单位，可以不在栅格上）
+        """
+        self.target = target
+        # 优先队列按 f 值分桶，桶宽为 0.01 个栅格，元素只存栅格 key，
+        # g 值统一从 g_score 读取，入队时不再为每个邻居额外构造元组
+        self.open_list = BucketQueue(0.01)
+        for source, g in sources.items():
+            self.open_list.push(g + get_dist(source, target), source)
+        self.g_score = dict(sources)  # 出发点到各栅格的当前最优距离
+        self.came_from = {}  # 记录每个栅格的父栅格，用于回溯路径
+        self.closed_set = set()
 
-            new_node = Node(new_x, new_y, new_z, g=g_cost, h=h_cost, parent=current_node)
+    def expand(self, is_blocked, other, best):
+        """
+        扩展本方向 f 值最小的节点
+        best 为当前已知最短路径 (长度, 相遇栅格)，若经由新邻居与另一方向相接得到更短路径则更新
+        """
+        key = self.open_list.pop()
 
-            heapq.heappush(open_list, new_node)
+        # 惰性删除：同一栅格可能多次入队，已扩展过的直接跳过
+        # （分桶队列只是近似有序，若之后找到更短的到达方式，该栅格会被重新打开）
+        if key in self.closed_set:
+            return best
+        self.closed_set.add(key)
 
-    print("未找到路径！")
-    return []
+        # 逐个检查 26 个邻居：只有找到更短的到达方式时才加入 Open List；
+        # 新邻居已被另一方向到达过时，两段拼接即为一条完整路径
+        tx, ty, tz = self.target
+        return _expand_neighbors(key, self.g_score[key], is_blocked, self.closed_set,
+                                 self.g_score, self.came_from, self.open_list.push,
+                                 other.g_score, tx, ty, tz, best)
 
 
-def reconstruct_path(node):
-    """从终点回溯到起点生成路径"""
-    path = []
-    current = node
-    while current:
-        path.append([current.x, current.y, current.z])
-        current = current.parent
-    return path[::-1]  # 反转列表
+def _astar_core(is_blocked, start_key, goal_ijk):
+    """
+    在栅格上执行双向 A*，坐标与代价均以栅格为单位
+    is_blocked(key) 判断栅格是否出界或碰撞
+    与终点距离小于一个栅格的可通行栅格都算作到达终点，路径长度计入该栅格到终点的距离
+    返回从起点栅格到终点附近栅格的 key 列表，找不到路径时返回空列表
+    """
+    # 反向搜索从终点附近所有可通行的栅格同时出发，初始 g 值为到终点的距离
+    gi, gj, gk = (int(math.floor(c)) for c in goal_ijk)
+    goal_cells = {}
+    for i in (gi, gi + 1):
+        for j in (gj, gj + 1):
+            for k in (gk, gk + 1):
+                d = get_dist((i, j, k), goal_ijk)
+                if d < 1 and not is_blocked((i, j, k)):
+                    goal_cells[(i, j, k)] = d
+    if not goal_cells:
+        return []
+
+    forward = _SearchFront({start_key: 0.0}, goal_ijk)
+    backward = _SearchFront(goal_cells, start_key)
+
+    # 当前已知最短路径 (长度, 相遇栅格)；起点本身就在终点附近时直接构成一条路径
+    best = (math.inf, None)
+    if start_key in goal_cells:
+        best = (goal_cells[start_key], start_key)
+
+    # 两个方向交替扩展，每次扩展 Open List 较小的一侧以保持两边规模均衡。
+    # 任一方向队首 f 值的下界不小于已知最短路径时，经过该方向剩余节点的路径都不会更短，
+    # 此时 best 即为最短路径；某一方向的 Open List 耗尽时同理
+    while forward.open_list and backward.open_list:
+        if best[0] <= max(forward.open_list.min_priority(), backward.open_list.min_priority()):
+            break
+        if len(forward.open_list) <= len(backward.open_list):
+            best = forward.expand(is_blocked, backward, best)
+        else:
+            best = backward.expand(is_blocked, forward, best)
+
+    meet = best[1]
+    if meet is None:
+        return []
+
+    # 取拼接长度最短的相遇栅格，分别回溯到起点和终点
+    keys = [meet]
+    while keys[-1] in forward.came_from:
+        keys.append(forward.came_from[keys[-1]])
+    keys.reverse()
+    while keys[-1] in backward.came_from:
+        keys.append(backward.came_from[keys[-1]])
+    return keys
+
+
+def reconstruct_path(keys, origin, step_size):
+    """将栅格 key 序列还原为坐标路径"""
+    x0, y0, z0 = origin
+    return [[x0 + i * step_size, y0 + j * step_size, z0 + k * step_size] for i, j, k in keys]
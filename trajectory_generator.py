@@ -15,9 +15,83 @@ beyond general scientific libraries such as numpy, math, or scipy. If you decide
 to use additional packages, you must clearly explain the reason in your report.
 """
 
+import math
+
 import numpy as np
-from scipy.interpolate import CubicSpline
-import matplotlib.pyplot as plt
+
+
+def _clamped_cubic(t, y):
+    """
+    求解两端速度为 0 的三次样条（clamped），返回每段多项式系数 (a, b, c, d)
+    第 i 段: S(t) = a + b*u + c*u^2 + d*u^3, u = t - t[i]
+    :param t: 节点时间，形状 (N,)，严格递增
+    :param y: 节点值，形状 (N, 3)，三列一起求解
+    """
+    n = len(t)
+    h = np.diff(t)
+    slopes = np.diff(y, axis=0) / h[:, None]
+
+    # 以各节点二阶导数 M 为未知量的三对角方程组
+    lower = np.empty(n)  # 下对角线
+    diag = np.empty(n)  # 主对角线
+    upper = np.empty(n)  # 上对角线
+    rhs = np.empty((n, y.shape[1]))
+
+    lower[0] = 0.0
+    diag[0] = 2.0 * h[0]
+    upper[0] = h[0]
+    rhs[0] = 6.0 * slopes[0]
+
+    lower[1:-1] = h[:-1]
+    diag[1:-1] = 2.0 * (h[:-1] + h[1:])
+    upper[1:-1] = h[1:]
+    rhs[1:-1] = 6.0 * (slopes[1:] - slopes[:-1])
+
+    lower[-1] = h[-1]
+    diag[-1] = 2.0 * h[-1]
+    upper[-1] = 0.0
+    rhs[-1] = -6.0 * slopes[-1]
+
+    # Thomas 算法：节点数只有几十到几百，逐行递推用 Python 浮点比逐行切片 ndarray 更快
+    lower, diag, upper, rhs = lower.tolist(), diag.tolist(), upper.tolist(), rhs.tolist()
+
+    # 前向消元
+    for i in range(1, n):
+        w = lower[i] / diag[i - 1]
+        diag[i] -= w * upper[i - 1]
+        prev, row = rhs[i - 1], rhs[i]
+        rhs[i] = [r - w * p for r, p in zip(row, prev)]
+
+    # 回代
+    m = [None] * n
+    m[-1] = [r / diag[-1] for r in rhs[-1]]
+    for i in range(n - 2, -1, -1):
+        m[i] = [(r - upper[i] * nxt) / diag[i] for r, nxt in zip(rhs[i], m[i + 1])]
+    m = np.array(m)
+
+    a = y[:-1]
+    b = slopes - h[:, None] * (2.0 * m[:-1] + m[1:]) / 6.0
+    c = m[:-1] / 2.0
+    d = (m[1:] - m[:-1]) / (6.0 * h[:, None])
+    return a, b, c, d
+
+
+class ClampedCubicSpline:
+    """多列三次样条，起止速度为 0，用 searchsorted + Horner 求值"""
+
+    def __init__(self, t, y):
+        self.t = np.asarray(t, dtype=float)
+        # 系数按段堆叠为 (N-1, 4, 3)，求值时一次索引取出 a, b, c, d
+        self.coeffs = np.stack(_clamped_cubic(self.t, np.asarray(y, dtype=float)), axis=1)
+
+    def __call__(self, t_eval):
+        t_eval = np.asarray(t_eval, dtype=float)
+        # 找到每个时刻所在的区间，超出范围的按首末段外推
+        idx = np.searchsorted(self.t, t_eval, side='right') - 1
+        np.clip(idx, 0, len(self.t) - 2, out=idx)
+        u = (t_eval - self.t[idx])[:, None]
+        a, b, c, d = self.coeffs[idx].transpose(1, 0, 2)
+        return a + u * (b + u * (c + u * d))
 
 
 class TrajectoryGenerator:
@@ -34,12 +108,12 @@ class TrajectoryGenerator:
             # 计算相邻点之间的距离
             # np.diff 计算 path[i+1] - path[i]
             diffs = np.diff(raw_path, axis=0)
-            # 计算欧几里得距离
-            dists = np.linalg.norm(diffs, axis=1)
+            # 计算距离的平方，只用于和阈值比较，无需开方
+            d2 = np.einsum('ij,ij->i', diffs, diffs)
 
             # 生成掩码：保留第一个点(True)，以及所有距离大于 0.001 的后续点
-            # 1e-3 是一个很小的阈值，用于过滤掉重复点
-            mask = np.concatenate(([True], dists > 1e-3))
+            # 1e-3 是一个很小的阈值，用于过滤掉重复点，平方后为 1e-6
+            mask = np.concatenate(([True], d2 > 1e-6))
 
             self.path = raw_path[mask]
         else:
@@ -55,22 +129,29 @@ class TrajectoryGenerator:
         self.avg_speed = average_speed
         self.time_knots = self._calculate_time_knots()
 
-        # 构建三次样条插值函数
-        # bc_type='clamped' 强制起止速度为0
-        self.cs_x = CubicSpline(self.time_knots, self.path[:, 0], bc_type='clamped')
-        self.cs_y = CubicSpline(self.time_knots, self.path[:, 1], bc_type='clamped')
-        self.cs_z = CubicSpline(self.time_knots, self.path[:, 2], bc_type='clamped')
+        # 构建三次样条插值函数，x/y/z 三列共用一组节点，一次求解
+        # 两端 clamped 强制起止速度为0
+        self.cs = ClampedCubicSpline(self.time_knots, self.path)
 
     def _calculate_time_knots(self):
-        """根据路径点之间的欧氏距离计算时间戳"""
+        """
+        按向心参数化（距离的 0.5 次方）计算时间戳
+        A* 路径拐角尖锐，直接按距离分配时间时样条在拐角处容易过冲；
+        向心参数化能减小过冲，总时长仍按平均速度折算为 总路程 / average_speed
+        """
         diffs = np.diff(self.path, axis=0)
         distances = np.sqrt((diffs ** 2).sum(axis=1))
 
         # 防止除零错误（虽然预处理已经过滤了，但加一层保险）
         distances = np.maximum(distances, 1e-6)
 
-        times = distances / self.avg_speed
-        time_knots = np.hstack(([0], np.cumsum(times)))
+        weights = np.sqrt(distances)
+        times = weights * (distances.sum() / weights.sum() / self.avg_speed)
+
+        # 预分配时间戳数组，累加结果直接写入，避免 hstack 额外拷贝
+        time_knots = np.empty(len(self.path))
+        time_knots[0] = 0.0
+        np.cumsum(times, out=time_knots[1:])
         return time_knots
 
     def solve(self, dt=0.1):
@@ -78,19 +159,18 @@ class TrajectoryGenerator:
             return np.array([]), np.array([]), np.array([]), np.array([])
 
         total_time = self.time_knots[-1]
-        t_eval = np.arange(0, total_time, dt)
+        # 直接按所需点数生成包含终点的时间序列，采样间隔不超过 dt
+        n = int(math.ceil(total_time / dt)) + 1
+        t_eval = np.linspace(0.0, total_time, n)
 
-        # 如果时间恰好整除，arange 可能不包含最后一个点，手动补齐以确保完整
-        if t_eval[-1] < total_time:
-            t_eval = np.append(t_eval, total_time)
+        xyz = self.cs(t_eval)
 
-        x_traj = self.cs_x(t_eval)
-        y_traj = self.cs_y(t_eval)
-        z_traj = self.cs_z(t_eval)
-
-        return t_eval, x_traj, y_traj, z_traj
+        return t_eval, xyz[:, 0], xyz[:, 1], xyz[:, 2]
 
     def visualize(self, dt=0.1):
+        # 只在需要画图时才导入 matplotlib，仅调用 solve() 时不必承担其导入开销
+        import matplotlib.pyplot as plt
+
         if len(self.path) < 2:
             print("无法可视化：路径点不足")
             return